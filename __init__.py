@@ -5,16 +5,25 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import sys
+from functools import partial
+from typing import Any, Dict, Optional
 
 import aqt
 from aqt import dialogs, mw
+from aqt.qt import qconnect
 
 
 # ---------------------------------------------------------------------------
 # Config handling
 # ---------------------------------------------------------------------------
 
+# Flache Entscheidungstabelle aus der Config; wird nur beim Import und nach
+# einer Config-Änderung durch den Nutzer neu aufgebaut.
+_decisions: Dict[str, bool] = {}
+_default_multi: bool = True
+
+
 def _get_config() -> Dict[str, Any]:
     """Return add-on config dict, always nonempty."""
     cfg = mw.addonManager.getConfig(__name__) or {}
@@ -34,23 +43,66 @@ def _get_config() -> Dict[str, Any]:
     return cfg
 
 
+def _rebuild_decisions(new_cfg: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Entscheidungstabelle {Dialogname: bool} aus der Config neu aufbauen.
+
+    Wird beim Import und nach jeder Config-Änderung durch den Nutzer
+    aufgerufen, damit should_be_multiple nur noch einen dict-Lookup macht.
+    Anki übergibt dabei die neue Config; die wird direkt übernommen, statt
+    sie erneut von der Platte zu lesen.
+    """
+    global _default_multi
+    multiple = new_cfg.get("multiple") if new_cfg is not None else None
+    if multiple is None:
+        # Fehlt der Abschnitt, schreibt _get_config die Defaults
+        multiple = _get_config()["multiple"]
+    _default_multi = bool(multiple.get("default", True))
+    # Nur Abweichungen vom Default speichern; alle anderen Namen landen
+    # direkt im Fallback von dict.get. Die Schlüssel werden interniert, damit
+    # Lookups mit den (bereits internierten) Literalen der Aufrufer per
+    # Pointer-Vergleich treffen.
+    _decisions.clear()
+    _decisions.update(
+        {
+            sys.intern(k): bool(v)
+            for k, v in multiple.items()
+            if k != "default" and bool(v) != _default_multi
+        }
+    )
+
+
 def should_be_multiple(name: str) -> bool:
     """Return True if dialog `name` darf mehrfach geöffnet werden."""
-    cfg = _get_config()
-    multiple = cfg.get("multiple", {})
-    if name in multiple:
-        return bool(multiple[name])
-    return bool(multiple.get("default", True))
+    return _decisions.get(name, _default_multi)
+
+
+_rebuild_decisions()
+mw.addonManager.setConfigUpdatedAction(__name__, _rebuild_decisions)
 
 
 # ---------------------------------------------------------------------------
 # Mehrere Instanzen offen halten
 # ---------------------------------------------------------------------------
 
-_open_multi_dialogs: List[Any] = []
+# Schlüssel ist id(instance), damit kein __eq__/__hash__ auf Qt-Widgets läuft
+_open_multi_dialogs: Dict[int, Any] = {}
+
+# Markierung am gepatchten open, damit ein erneuter Import (Add-on Reload)
+# den Patch nicht stapelt, sondern das echte Original wiederverwendet.
+_PATCHED_ATTR = "__multiple_windows_patched__"
+_ORIGINAL_ATTR = "__multiple_windows_original__"
 
 # Originalfunktion sichern, damit wir bei Bedarf zurückfallen können
-_original_open = dialogs.open
+if getattr(dialogs.open, _PATCHED_ATTR, False):
+    _original_open = getattr(dialogs.open, _ORIGINAL_ATTR)
+else:
+    _original_open = dialogs.open
+
+# Interne Tabelle des DialogManagers einmalig binden. Anki verändert das dict
+# nur in-place (register_dialog, markClosed), die Referenz bleibt also gültig.
+# Fehlt sie, schlägt jeder Lookup fehl und wir fallen auf _original_open zurück.
+_DIALOGS_TABLE: Dict[str, Any] = getattr(dialogs, "_dialogs", {})
 
 
 def _open_patched(name: str, *args: Any, **kwargs: Any) -> Any:
@@ -66,11 +118,9 @@ def _open_patched(name: str, *args: Any, **kwargs: Any) -> Any:
     if not should_be_multiple(name):
         return _original_open(name, *args, **kwargs)
 
-    dm = dialogs  # aqt.DialogManager Instanz
-
     # Versuche, den Creator aus der internen _dialogs Tabelle zu holen
     try:
-        creator, _existing_instance = dm._dialogs[name]  # type: ignore[attr-defined]
+        creator, _existing_instance = _DIALOGS_TABLE[name]
     except Exception:
         # Wenn das aus irgendeinem Grund fehlschlägt, lieber sicher zurückfallen
         # auf das Standardverhalten, statt Anki abzuschießen.
@@ -78,32 +128,40 @@ def _open_patched(name: str, *args: Any, **kwargs: Any) -> Any:
 
     # Neue Instanz erzeugen, ohne die gespeicherte Singleton-Instanz zu überschreiben
     instance = creator(*args, **kwargs)
-    _open_multi_dialogs.append(instance)
+    _open_multi_dialogs[id(instance)] = instance
 
-    # Dafür sorgen, dass beim Schließen die Instanz aus unserer Liste fliegt
-    _wrap_close_for_instance(instance)
+    # Instanz wieder vergessen, sobald Qt das Fenster zerstört
+    _watch_qobject(instance)
 
     return instance
 
 
-def _wrap_close_for_instance(instance: Any) -> None:
+def _watch_qobject(instance: Any) -> None:
     """
-    close Methode der Instanz wrapen, damit sie aus _open_multi_dialogs
-    entfernt wird, wenn das Fenster geschlossen wird.
+    Instanz aus _open_multi_dialogs entfernen, wenn Qt das Objekt zerstört.
+
+    Anki räumt geschlossene Dialoge per deleteLater() ab, destroyed feuert
+    also zuverlässig, ohne dass close() gewrappt werden muss. Eine reine
+    weakref-Verwaltung ginge nicht: unsere Referenz ist die einzige, die
+    Python-eigene Top-Level-Fenster am Leben hält.
     """
-    if not hasattr(instance, "close"):
+    destroyed = getattr(instance, "destroyed", None)
+    if destroyed is None:
         return
 
-    original_close = instance.close
+    # Kein eigener Closure pro Fenster: ein gemeinsamer Slot, partial hält
+    # nur noch den Schlüssel.
+    qconnect(destroyed, partial(_forget_instance, id(instance)))
 
-    def wrapped_close(*args: Any, **kwargs: Any) -> Any:
-        if instance in _open_multi_dialogs:
-            _open_multi_dialogs.remove(instance)
-        return original_close(*args, **kwargs)
 
-    # type: ignore, da wir dynamisch zur Laufzeit patchen
-    instance.close = wrapped_close  # type: ignore[assignment]
+def _forget_instance(key: int, *_args: Any) -> None:
+    """Slot für destroyed: Eintrag `key` aus _open_multi_dialogs entfernen."""
+    _open_multi_dialogs.pop(key, None)
 
 
-# Patch aktivieren
+# Patch aktivieren. Ein bereits installierter Patch (aus einem früheren
+# Import) wird ersetzt statt umwickelt, sodass nie mehr als ein Wrapper vor
+# dem Original liegt.
+setattr(_open_patched, _PATCHED_ATTR, True)
+setattr(_open_patched, _ORIGINAL_ATTR, _original_open)
 dialogs.open = _open_patched